@@ -3,8 +3,14 @@ from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
 import openpyxl
 import re
+import os
 import sys
+import json
+import sqlite3
 from collections import defaultdict
+from contextlib import closing
+from itertools import chain, islice
+from openpyxl.utils import get_column_letter
 
 
 # === GUI Setup ===
@@ -27,6 +33,7 @@ template1_color_var = tk.StringVar()
 template3_color_var = tk.StringVar()
 template3_style_var = tk.StringVar()
 overwrite_all = None
+index_warning_shown = False
 store_ready_var = tk.BooleanVar(value=False)
 pre_ticketed_var = tk.BooleanVar(value=False)
 auto_style_var = tk.BooleanVar()
@@ -36,15 +43,16 @@ style_metadata = {}
 style_fields = {}
 
 # === Constants == 
+HEADER_ROWS = 16  # rows above the first carton row
 SIZES = ["XS", "S", "M", "L", "XL", "2XL", "3XL", "4XL"]
 
 # === Helper Functions ===
-def get_size_ratio_string(carton):
+def get_size_ratio_string(carton, template=None):
     paired = [(label, qty or 0) for label, qty in zip(SIZES, carton["size_quantities"]) if qty]
     if not paired:
         return ("", "")
     
-    if template_var.get() == "Template 2":
+    if (template or template_var.get()) == "Template 2":
         ratio_string = ", ".join(f"{label} ({qty})" for label, qty in paired)
         return (ratio_string, "")  # qty string not needed in this format
     else:
@@ -112,7 +120,6 @@ def collect_unique_styles():
     if not source_folder_path:
         return {}
 
-    from openpyxl import load_workbook
     path = Path(source_folder_path)
     if not path.exists():
         return {}
@@ -122,17 +129,14 @@ def collect_unique_styles():
 
     for file in file_list:
         filename = file.name
-        wb = load_workbook(file, read_only=True, data_only=True)
-        ws = wb.active
+        with closing(openpyxl.load_workbook(file, read_only=True, data_only=True)) as wb:
+            shipments = load_shipments(wb)
 
-        for row in ws.iter_rows(min_row=17, values_only=True):
-            non_empty = [cell for idx, cell in enumerate(row[:6]) if idx not in (3, 5)]
-            if all(cell is None for cell in non_empty):
-                break
-
-            style, desc = row[8], row[9]
-            if style and desc:
-                styles_by_file.setdefault(filename, set()).add((style, desc))
+        for _, _, cartons in shipments:
+            for carton in cartons:
+                style, desc = carton["vendor_style"], carton["description"]
+                if style and desc:
+                    styles_by_file.setdefault(filename, set()).add((style, desc))
 
     # Convert sets to sorted lists for display
     return {file: sorted(styles) for file, styles in styles_by_file.items()}
@@ -176,7 +180,18 @@ def choose_destination_folder():
 
 
 # === Parsing Logic ===
-def parse_packing_header(ws):
+def read_header_cells(rows):
+    """
+    Maps cell coordinates (e.g. "B5") to values for the rows above the carton table.
+    """
+    return {
+        f"{get_column_letter(col)}{row}": value
+        for row, values in enumerate(rows, start=1)
+        for col, value in enumerate(values, start=1)
+        if value is not None
+    }
+
+def parse_packing_header(cells):
 
     """
     Extracts general shipping/invoice data from the top region of the packing list.
@@ -184,21 +199,21 @@ def parse_packing_header(ws):
 
     header_data = {
 
-        "ship_to_address_line1": ws["B5"].value,
-        "ship_to_address_line2": ws["B6"].value,
-        "ship_to_address_line3": ws["B7"].value,
-        "ship_to_address_line4": ws["B8"].value,
+        "ship_to_address_line1": cells.get("B5"),
+        "ship_to_address_line2": cells.get("B6"),
+        "ship_to_address_line3": cells.get("B7"),
+        "ship_to_address_line4": cells.get("B8"),
 
-        "shipper_address_line1": ws["L5"].value,
-        "shipper_address_line2": ws["L6"].value,
-        "shipper_address_line3": ws["L7"].value,
+        "shipper_address_line1": cells.get("L5"),
+        "shipper_address_line2": cells.get("L6"),
+        "shipper_address_line3": cells.get("L7"),
 
-        "invoice_number": ws["H10"].value,
+        "invoice_number": cells.get("H10"),
 
-        "total_units": ws["S14"].value,
-        "total_weight": round(ws["I14"].value, 1),
+        "total_units": cells.get("S14"),
+        "total_weight": round(cells.get("I14"), 1),
 
-        "cubic_feet": round(ws["C14"].value, 1),
+        "cubic_feet": round(cells.get("C14"), 1),
         # Add more as needed
 
     }
@@ -206,8 +221,8 @@ def parse_packing_header(ws):
     # ===Error handling the PO Box and pallets variables, since the formatting may be inconsistent
 
     # === PO Box handling ===
-    primary_po_cell = ws["C10"].value
-    fallback_po_cell = ws["B10"].value
+    primary_po_cell = cells.get("C10")
+    fallback_po_cell = cells.get("B10")
 
     if primary_po_cell is None:
         match = re.search(r"PO#:\s*([\d\s]+)", str(fallback_po_cell))
@@ -219,8 +234,8 @@ def parse_packing_header(ws):
         header_data["po_box"] = str(primary_po_cell).strip()
 
     # === Pallet number handling ===
-    primary_pallet_cell = ws["C12"].value
-    fallback_pallet_cell = ws["B12"].value
+    primary_pallet_cell = cells.get("C12")
+    fallback_pallet_cell = cells.get("B12")
 
     if primary_pallet_cell is None:
         match = re.search(r"# of Pallets:\s*([\d\s]+)", str(fallback_pallet_cell))
@@ -236,11 +251,11 @@ def parse_packing_header(ws):
         
     return header_data
 
-# Parse the packing list
-def parse_packing_list(ws, start_row=17):
+# Parse the packing list (rows from the first carton row, row 17, onwards)
+def parse_packing_list(rows):
     cartons = []
 
-    for row in ws.iter_rows(min_row=start_row, values_only=True):
+    for row in rows:
         # Stop parsing when rows are empty except columns D and F (which sometimes are filled in otherwise empty rows)
         non_empty = [cell for idx, cell in enumerate(row[:6]) if idx not in (3, 5)]
         if all(cell is None for cell in row[:6]):
@@ -261,11 +276,336 @@ def parse_packing_list(ws, start_row=17):
         cartons.append(carton)
     return cartons
 
+def is_packing_list_sheet(cells, first_carton_row):
+    """
+    Checks the header cells and the first carton row (row 17) to tell packing list tabs apart from other worksheets.
+    """
+    has_po = cells.get("C10") is not None or cells.get("B10") is not None
+    has_totals = all(isinstance(cells.get(cell), (int, float)) for cell in ("C14", "I14"))
+    return has_po and has_totals and any(cell is not None for cell in first_carton_row[:6])
+
+def parse_shipment(ws, force=False):
+    """
+    Reads a worksheet in a single pass. Returns (sheet title, header, cartons),
+    or None when the sheet isn't shaped like a packing list (unless forced).
+    """
+    rows = ws.iter_rows(values_only=True)
+    cells = read_header_cells(islice(rows, HEADER_ROWS))
+    first_carton_row = next(rows, ())
+
+    if not force and not is_packing_list_sheet(cells, first_carton_row):
+        return None
+
+    return ws.title, parse_packing_header(cells), parse_packing_list(chain([first_carton_row], rows))
+
+def load_shipments(source_wb):
+    """
+    Parses every packing list worksheet in a workbook.
+    Returns (sheet title, header, cartons) per shipment, in workbook order.
+    Falls back to the active sheet when no tab looks like a packing list.
+    """
+    shipments = [shipment for shipment in map(parse_shipment, source_wb.worksheets) if shipment]
+    return shipments or [parse_shipment(source_wb.active, force=True)]
+
+def get_output_path(file, sheet_title=None):
+    # Single-shipment workbooks keep the original file name; multi-tab workbooks get their own folder with one file per tab
+    if sheet_title is None:
+        return Path(destination_folder_path) / f"{file.stem}-LABELS.xlsx"
+    safe_title = re.sub(r'[<>:"/\\|?*]', "_", sheet_title).strip()
+    return Path(destination_folder_path) / f"{file.stem}-LABELS" / f"{safe_title}-LABELS.xlsx"
+
+def select_shipments(file):
+    """
+    Returns (output path, sheet title, header, cartons) for each shipment in the workbook whose label file may be written.
+    Single-tab workbooks are checked for overwrites before they are parsed.
+    """
+    with closing(openpyxl.load_workbook(file, read_only=True, data_only=True)) as source_wb:
+        if len(source_wb.worksheets) == 1:
+            out_path = get_output_path(file)
+            if not confirm_overwrite_if_needed(out_path):
+                print("Skipped:", out_path.name)
+                return []
+            return [(out_path, *parse_shipment(source_wb.active, force=True))]
+
+        shipments = load_shipments(source_wb)
+
+    selected = []
+    for sheet_title, header, cartons in shipments:
+        out_path = get_output_path(file, sheet_title if len(shipments) > 1 else None)
+        if not confirm_overwrite_if_needed(out_path):
+            print("Skipped:", out_path.name)
+            continue
+        selected.append((out_path, sheet_title, header, cartons))
+    return selected
+
+
+# === Template Cell Mappings ===
+TEMPLATE_FILES = {
+    "Template 1": "template1.xlsx",
+    "Template 2": "template2.xlsx",
+    "Template 3": "template3.xlsx",
+}
+
+def fill_template1_sheet(sheet, header, carton, i, total, options):
+    ratio, qtys = get_size_ratio_string(carton, "Template 1")
+
+    sheet["G4"] = header["ship_to_address_line1"]
+    sheet["G5"] = header["ship_to_address_line2"]
+    sheet["G6"] = header["ship_to_address_line3"]
+    sheet["G7"] = header["ship_to_address_line4"]
+
+    sheet["C4"] = header["shipper_address_line1"]
+    sheet["C5"] = f'{header["shipper_address_line2"]}, {header["shipper_address_line3"]}'
+    sheet["C7"] = header["po_box"]
+    sheet["E11"] = ratio
+    sheet["E12"] = qtys
+    sheet["B11"] = f'{carton["description"]} # {carton["vendor_style"]}'
+    sheet["G11"] = options["color"]
+    sheet["I11"] = carton["total_units"]
+    sheet["C14"] = options["store_ready"]
+    sheet["C15"] = options["pre_ticketed"]
+    sheet["H14"] = f'{i} of {total}'
+
+def fill_template2_sheet(sheet, header, carton, i, total, options):
+    ratio, qtys = get_size_ratio_string(carton, "Template 2")
+
+    sheet["D3"] = header["shipper_address_line1"]
+    sheet["D4"] = header["shipper_address_line2"]
+    sheet["D5"] = header["shipper_address_line3"]
+    sheet["D7"] = header["ship_to_address_line1"]
+    sheet["D8"] = header["ship_to_address_line2"]
+    sheet["D9"] = header["ship_to_address_line3"]
+    sheet["D11"] = header["po_box"]
+    #sheet["E12"] = header["dept_num"]
+    sheet["E13"] = carton["vendor_style"]
+    sheet["E14"] = carton["description"]
+    sheet["E15"] = ratio
+    sheet["E16"] = f'{i} of {total}'
+    sheet["E17"] = carton["weight"]
+    sheet["E18"] = total
+
+def fill_template3_sheet(sheet, header, carton, i, total, options):
+    sheet["D2"] = header["ship_to_address_line1"]
+    sheet["D3"] = header["ship_to_address_line2"]
+    sheet["D4"] = header["ship_to_address_line3"]
+    sheet["D5"] = header["ship_to_address_line4"]
+    sheet["D6"] = header["po_box"]
+    sheet["D7"] = options["style"]
+    sheet["D8"] = carton["description"]
+    sheet["D9"] = options["color"]
+
+    for j, qty in enumerate(carton["size_quantities"][1:]):
+        sheet.cell(row=12, column=j + 4).value = qty
+
+    sheet["D13"] = carton["weight"]
+    sheet["D14"] = carton["carton_dimension1"]
+    sheet["F14"] = carton["carton_dimension2"]
+    sheet["H14"] = carton["carton_dimension3"]
+    sheet["D15"] = i
+    sheet["F15"] = total
+
+TEMPLATE_FILLERS = {
+    "Template 1": fill_template1_sheet,
+    "Template 2": fill_template2_sheet,
+    "Template 3": fill_template3_sheet,
+}
+
+
+# === Label Index (single-carton reprints) ===
+# Kept in a per-user data folder, since the app's own folder often isn't writable in the frozen build
+user_data_path = Path(os.environ["LOCALAPPDATA"]) if os.environ.get("LOCALAPPDATA") else Path.home() / ".local" / "share"
+LABEL_INDEX_PATH = user_data_path / "ShippingLabelGenerator" / "label_index.db"
+
+def open_label_index():
+    LABEL_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(LABEL_INDEX_PATH)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS labels (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            template TEXT NOT NULL,
+            po_box TEXT,
+            invoice_number TEXT,
+            carton_index INTEGER NOT NULL,
+            carton_count INTEGER NOT NULL,
+            carton_number TEXT,
+            vendor_style TEXT,
+            description TEXT,
+            source_file TEXT,
+            output_file TEXT,
+            sheet_name TEXT,
+            header_json TEXT,
+            carton_json TEXT,
+            options_json TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS labels_po_carton ON labels (po_box, carton_index)")
+    return conn
+
+def make_index_row(template, source_file, out_path, sheet_name, header, carton, i, total, options):
+    return (
+        template,
+        header["po_box"],
+        None if header["invoice_number"] is None else str(header["invoice_number"]),
+        i,
+        total,
+        None if carton["carton_number"] is None else str(carton["carton_number"]),
+        carton["vendor_style"],
+        carton["description"],
+        str(source_file),
+        str(out_path),
+        sheet_name,
+        json.dumps(header, default=str),
+        json.dumps(carton, default=str),
+        json.dumps(options, default=str),
+    )
+
+def index_labels(out_path, rows):
+    """
+    Replaces the index entries for an output file with the cartons just saved to it.
+    Indexing failures are reported once per run and never stop label generation.
+    """
+    global index_warning_shown
+
+    try:
+        with closing(open_label_index()) as conn, conn:
+            conn.execute("DELETE FROM labels WHERE output_file = ?", (str(out_path),))
+            conn.executemany(
+                """
+                INSERT INTO labels (
+                    template, po_box, invoice_number, carton_index, carton_count, carton_number,
+                    vendor_style, description, source_file, output_file, sheet_name,
+                    header_json, carton_json, options_json
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+    except (sqlite3.Error, OSError) as e:
+        print("Could not index labels for", out_path.name, "-", e)
+        if not index_warning_shown:
+            index_warning_shown = True
+            messagebox.showwarning("Label Index Unavailable", f"Labels are still being generated, but they could not be recorded for reprinting:\n\n{e}")
+
+def find_indexed_labels(po_box, carton_index, invoice_number=None):
+    """
+    Returns every indexed label for a PO and carton, newest first, optionally narrowed to one invoice.
+    """
+    query = "SELECT * FROM labels WHERE po_box = ? AND carton_index = ?"
+    params = [po_box, carton_index]
+    if invoice_number:
+        query += " AND invoice_number = ?"
+        params.append(invoice_number)
+
+    with closing(open_label_index()) as conn:
+        conn.row_factory = sqlite3.Row
+        return conn.execute(query + " ORDER BY id DESC", params).fetchall()
+
+def choose_indexed_label(entries):
+    """
+    Asks the operator which shipment to reprint when several match. Returns None if cancelled.
+    """
+    dialog = tk.Toplevel(window)
+    dialog.title("Choose Shipment")
+    tk.Label(dialog, text="More than one shipment matches this PO and carton.\nChoose the label to reprint:").pack(padx=20, pady=10)
+
+    listbox = tk.Listbox(dialog, width=100, height=min(len(entries), 10))
+    for entry in entries:
+        listbox.insert(
+            "end",
+            f'{Path(entry["source_file"]).name} → {Path(entry["output_file"]).name} ({entry["sheet_name"]} of {entry["carton_count"]})'
+            f' — Invoice {entry["invoice_number"]} — {entry["created_at"]}',
+        )
+    listbox.pack(padx=20, fill="x")
+
+    response = {"choice": None}
+
+    def choose():
+        selection = listbox.curselection()
+        if selection:
+            response["choice"] = entries[selection[0]]
+            dialog.destroy()
+
+    btn_frame = tk.Frame(dialog)
+    btn_frame.pack(pady=10)
+
+    tk.Button(btn_frame, text="Reprint", width=10, command=choose).pack(side="left", padx=5)
+    tk.Button(btn_frame, text="Cancel", width=10, command=dialog.destroy).pack(side="left", padx=5)
+
+    dialog.grab_set()
+    window.wait_window(dialog)
+
+    return response["choice"]
+
+def reprint_carton_label():
+    global overwrite_all
+    overwrite_all = None
+
+    if not destination_folder_path:
+        messagebox.showerror("Path Not Set", "Please select a destination folder before reprinting a label.")
+        return
+
+    po_box = reprint_po_var.get().strip()
+    carton_text = reprint_carton_var.get().strip()
+    invoice_number = reprint_invoice_var.get().strip()
+    if not po_box or not carton_text.isdigit():
+        messagebox.showerror("Invalid Input", "Please enter a PO number and a carton number.")
+        return
+
+    try:
+        entries = find_indexed_labels(po_box, int(carton_text), invoice_number)
+    except (sqlite3.Error, OSError) as e:
+        messagebox.showerror("Label Index Unavailable", f"Could not read the label index:\n\n{e}")
+        return
+    if not entries:
+        messagebox.showinfo("Not Found", f"No indexed label found for PO {po_box}, carton {carton_text}.")
+        return
+
+    # Several shipments can share a PO (and even an invoice), so never pick one silently
+    entry = entries[0] if len(entries) == 1 else choose_indexed_label(entries)
+    if entry is None:
+        return
+
+    # Multi-tab labels live in a per-workbook folder; reprints mirror that layout
+    output_file = Path(entry["output_file"])
+    out_dir = Path(destination_folder_path)
+    if output_file.parent.name == f'{Path(entry["source_file"]).stem}-LABELS':
+        out_dir = out_dir / output_file.parent.name
+    out_path = out_dir / f'{output_file.stem}-CARTON{entry["carton_index"]}-REPRINT.xlsx'
+    if not confirm_overwrite_if_needed(out_path):
+        print("Skipped:", out_path.name)
+        return
+
+    template_path = base_path / "templates" / TEMPLATE_FILES[entry["template"]]
+    label_wb = openpyxl.load_workbook(template_path, data_only=True)
+    template = label_wb.active
+
+    for sheet in label_wb.worksheets:
+        if sheet != template:
+            label_wb.remove(sheet)
+
+    new_sheet = label_wb.copy_worksheet(template)
+    new_sheet.title = entry["sheet_name"]
+    TEMPLATE_FILLERS[entry["template"]](
+        new_sheet,
+        json.loads(entry["header_json"]),
+        json.loads(entry["carton_json"]),
+        entry["carton_index"],
+        entry["carton_count"],
+        json.loads(entry["options_json"]),
+    )
+    label_wb.remove(template)
+
+    out_path.parent.mkdir(exist_ok=True)
+    label_wb.save(out_path)
+    print("Saved reprint to:", out_path)
+    messagebox.showinfo("Done", f"Reprinted {entry['sheet_name']} of {entry['source_file']} to:\n\n{out_path}")
+
 
 # === Label Generation Functions === 
 def generate_labels():
-    global overwrite_all
+    global overwrite_all, index_warning_shown
     overwrite_all = None
+    index_warning_shown = False
 
     selected = template_var.get()
     if selected == "Template 1":
@@ -295,70 +635,42 @@ def generate_template1_labels():
             print("Skipping temporary file:", file.name) #Skip temporary files created by Excel
             continue
 
-        out_path = Path(destination_folder_path) / f"{file.stem}-LABELS.xlsx"
-
-        if not confirm_overwrite_if_needed(out_path):
-            print("Skipped:", out_path.name)
-            continue
-        
         print("Processing ", file.name)
-    
-        # Load input packing list
-        source_wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
-        packing_list = source_wb.active
-
-        # Load template workbook
-        template_path = base_path / "templates" / "template1.xlsx"
-        label_wb = openpyxl.load_workbook(template_path, data_only=True)
-        template = label_wb.active
-
-        # === Parse and display header info ===
-        header = parse_packing_header(packing_list)
-        print("Header data:", header)
-
-        # === Parse and display carton info ===
-        cartons = parse_packing_list(packing_list)
-        print("Carton data: ", cartons)
-
-
-        # === Output to label template (stub for now) ===
-        store_ready = "Yes" if store_ready_var.get() else "No"
-        pre_ticketed = "Yes" if pre_ticketed_var.get() else "No"
-        for i, carton in enumerate(cartons, start=1):
-            print(f"Carton {i} of {len(cartons)}")
-
-            key = (file.name, carton["vendor_style"], carton["description"])
-            meta = style_metadata.get(key)
-            color = meta["color"] if meta else template1_color_var.get().strip()
-
-            
-            new_sheet = label_wb.copy_worksheet(template)
-            new_sheet.title = f"Carton {i}"
-            # TODO: Manually map carton + header values to template cells
-            ratio, qtys = get_size_ratio_string(carton)
-
-            new_sheet["G4"] = header["ship_to_address_line1"]
-            new_sheet["G5"] = header["ship_to_address_line2"]
-            new_sheet["G6"] = header["ship_to_address_line3"]
-            new_sheet["G7"] = header["ship_to_address_line4"]
-
-            new_sheet["C4"] = header["shipper_address_line1"]
-            new_sheet["C5"] = f'{header["shipper_address_line2"]}, {header["shipper_address_line3"]}'
-            new_sheet["C7"] = header["po_box"]
-            new_sheet["E11"] = ratio 
-            new_sheet["E12"] = qtys
-            new_sheet["B11"] = f'{carton["description"]} # {carton["vendor_style"]}'
-            new_sheet["G11"] = color
-            new_sheet["I11"] = carton["total_units"]
-            new_sheet["C14"] = store_ready
-            new_sheet["C15"] = pre_ticketed
-            new_sheet["H14"] = f'{i} of {len(cartons)}'
-            
-        label_wb.remove(template)
-
-        label_wb.save(out_path)
-        saved_count += 1
-        print("Saved label to:", out_path)
+
+        # === Parse every packing list tab in the workbook ===
+        for out_path, sheet_title, header, cartons in select_shipments(file):
+            print("Shipment:", sheet_title)
+            print("Header data:", header)
+            print("Carton data: ", cartons)
+
+            # Load template workbook
+            template_path = base_path / "templates" / "template1.xlsx"
+            label_wb = openpyxl.load_workbook(template_path, data_only=True)
+            template = label_wb.active
+
+            store_ready = "Yes" if store_ready_var.get() else "No"
+            pre_ticketed = "Yes" if pre_ticketed_var.get() else "No"
+            index_rows = []
+            for i, carton in enumerate(cartons, start=1):
+                print(f"Carton {i} of {len(cartons)}")
+
+                key = (file.name, carton["vendor_style"], carton["description"])
+                meta = style_metadata.get(key)
+                color = meta["color"] if meta else template1_color_var.get().strip()
+                options = {"color": color, "store_ready": store_ready, "pre_ticketed": pre_ticketed}
+
+                new_sheet = label_wb.copy_worksheet(template)
+                new_sheet.title = f"Carton {i}"
+                fill_template1_sheet(new_sheet, header, carton, i, len(cartons), options)
+                index_rows.append(make_index_row("Template 1", file, out_path, new_sheet.title, header, carton, i, len(cartons), options))
+
+            label_wb.remove(template)
+
+            out_path.parent.mkdir(exist_ok=True)
+            label_wb.save(out_path)
+            index_labels(out_path, index_rows)
+            saved_count += 1
+            print("Saved label to:", out_path)
 
     if saved_count > 0:
         messagebox.showinfo("Done", f"{saved_count} label file(s) saved to:\n\n{destination_folder_path}")
@@ -383,60 +695,35 @@ def generate_template2_labels():
             print("Skipping temporary file:", file.name) #Skip temporary files created by Excel
             continue
 
-        out_path = Path(destination_folder_path) / f"{file.stem}-LABELS.xlsx"
+        print("Processing ", file.name)
 
-        if not confirm_overwrite_if_needed(out_path):
-            print("Skipped:", out_path.name)
-            continue
+        # === Parse every packing list tab in the workbook ===
+        for out_path, sheet_title, header, cartons in select_shipments(file):
+            print("Shipment:", sheet_title)
+            print("Header data:", header)
+            print("Carton data: ", cartons)
 
-        print("Processing ", file.name)
-    
-        # Load input packing list
-        source_wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
-        packing_list = source_wb.active
-
-        # Load template workbook
-        template_path = base_path / "templates" / "template2.xlsx"
-        label_wb = openpyxl.load_workbook(template_path, data_only=True)
-        template = label_wb.active
-
-        # === Parse and display header info ===
-        header = parse_packing_header(packing_list)
-        print("Header data:", header)
-
-        # === Parse and display carton info ===
-        cartons = parse_packing_list(packing_list)
-        print("Carton data: ", cartons)
-
-
-        for i, carton in enumerate(cartons, start=1):
-            print(f"Carton {i} of {len(cartons)}")
-            
-            new_sheet = label_wb.copy_worksheet(template)
-            new_sheet.title = f"Carton {i}"
-            ratio, qtys = get_size_ratio_string(carton)
-
-            # TODO: Manually map carton + header values to template cells
-            new_sheet["D3"] = header["shipper_address_line1"]
-            new_sheet["D4"] = header["shipper_address_line2"]
-            new_sheet["D5"] = header["shipper_address_line3"]
-            new_sheet["D7"] = header["ship_to_address_line1"]
-            new_sheet["D8"] = header["ship_to_address_line2"]
-            new_sheet["D9"] = header["ship_to_address_line3"]
-            new_sheet["D11"] = header["po_box"]
-            #new_sheet["E12"] = header["dept_num"]
-            new_sheet["E13"] = carton["vendor_style"]
-            new_sheet["E14"] = carton["description"]
-            new_sheet["E15"] = ratio
-            new_sheet["E16"] = f'{i} of {len(cartons)}'
-            new_sheet["E17"] = carton["weight"]
-            new_sheet["E18"] = len(cartons)
-            
-        label_wb.remove(template)
-
-        label_wb.save(out_path)
-        saved_count += 1
-        print("Saved label to:", out_path)
+            # Load template workbook
+            template_path = base_path / "templates" / "template2.xlsx"
+            label_wb = openpyxl.load_workbook(template_path, data_only=True)
+            template = label_wb.active
+
+            index_rows = []
+            for i, carton in enumerate(cartons, start=1):
+                print(f"Carton {i} of {len(cartons)}")
+
+                new_sheet = label_wb.copy_worksheet(template)
+                new_sheet.title = f"Carton {i}"
+                fill_template2_sheet(new_sheet, header, carton, i, len(cartons), {})
+                index_rows.append(make_index_row("Template 2", file, out_path, new_sheet.title, header, carton, i, len(cartons), {}))
+
+            label_wb.remove(template)
+
+            out_path.parent.mkdir(exist_ok=True)
+            label_wb.save(out_path)
+            index_labels(out_path, index_rows)
+            saved_count += 1
+            print("Saved label to:", out_path)
 
     if saved_count > 0:
         messagebox.showinfo("Done", f"{saved_count} label file(s) saved to:\n\n{destination_folder_path}")
@@ -462,70 +749,45 @@ def generate_template3_labels():
             print("Skipping temporary file:", file.name) #Skip temporary files created by Excel
             continue
 
-        out_path = Path(destination_folder_path) / f"{file.stem}-LABELS.xlsx"
-
-        if not confirm_overwrite_if_needed(out_path):
-            print("Skipped:", out_path.name)
-            continue
-
         print("Processing ", file.name)
 
-        source_wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
-        packing_list = source_wb.active
-
-        template_path = base_path / "templates" / "template3.xlsx"
-        label_wb = openpyxl.load_workbook(template_path, data_only=True)
-        template = label_wb.active
+        for out_path, sheet_title, header, cartons in select_shipments(file):
+            print("Shipment:", sheet_title)
+            print("Header data:", header)
+            print("Carton data:", cartons)
 
-        # Remove all extra sheets except the template
-        for sheet in label_wb.worksheets:
-            if sheet != template:
-                label_wb.remove(sheet)
+            template_path = base_path / "templates" / "template3.xlsx"
+            label_wb = openpyxl.load_workbook(template_path, data_only=True)
+            template = label_wb.active
 
-        header = parse_packing_header(packing_list)
-        print("Header data:", header)
+            # Remove all extra sheets except the template
+            for sheet in label_wb.worksheets:
+                if sheet != template:
+                    label_wb.remove(sheet)
 
-        cartons = parse_packing_list(packing_list)
-        print("Carton data:", cartons)
+            index_rows = []
+            for i, carton in enumerate(cartons, start=1):
+                print(f"Carton {i} of {len(cartons)}")
 
-        for i, carton in enumerate(cartons, start=1):
-            print(f"Carton {i} of {len(cartons)}")
+                key = (file.name, carton["vendor_style"], carton["description"])
+                meta = style_metadata.get(key)
+                color = meta["color"] if meta else template3_color_var.get().strip()
 
-            key = (file.name, carton["vendor_style"], carton["description"])
-            meta = style_metadata.get(key)
-            color = meta["color"] if meta else template3_color_var.get().strip()
+                style = meta["template3_style"] if meta else template3_style_var.get().strip()
+                options = {"color": color, "style": style}
 
-            style = meta["template3_style"] if meta else template3_style_var.get().strip()
+                new_sheet = label_wb.copy_worksheet(template)
+                new_sheet.title = f"Carton {i}"
+                fill_template3_sheet(new_sheet, header, carton, i, len(cartons), options)
+                index_rows.append(make_index_row("Template 3", file, out_path, new_sheet.title, header, carton, i, len(cartons), options))
 
-            new_sheet = label_wb.copy_worksheet(template)
-            new_sheet.title = f"Carton {i}"
-            ratio, qtys = get_size_ratio_string(carton)
+            label_wb.remove(template)
 
-            # Mappings for template3
-            new_sheet["D2"] = header["ship_to_address_line1"]
-            new_sheet["D3"] = header["ship_to_address_line2"]
-            new_sheet["D4"] = header["ship_to_address_line3"]
-            new_sheet["D5"] = header["ship_to_address_line4"]
-            new_sheet["D6"] = header["po_box"]
-            new_sheet["D7"] = style
-            new_sheet["D8"] = carton["description"]
-            new_sheet["D9"] = color
-
-            for j, qty in enumerate(carton["size_quantities"][1:]):
-                new_sheet.cell(row=12, column=j + 4).value = qty
-
-            new_sheet["D13"] = carton["weight"]
-            new_sheet["D14"] = carton["carton_dimension1"]
-            new_sheet["F14"] = carton["carton_dimension2"]
-            new_sheet["H14"] = carton["carton_dimension3"]
-            new_sheet["D15"] = i
-            new_sheet["F15"] = len(cartons)
-
-        label_wb.remove(template)
-
-        label_wb.save(out_path)
-        saved_count += 1
-        print("Saved label to:", out_path)
+            out_path.parent.mkdir(exist_ok=True)
+            label_wb.save(out_path)
+            index_labels(out_path, index_rows)
+            saved_count += 1
+            print("Saved label to:", out_path)
 
     if saved_count > 0:
         messagebox.showinfo("Done", f"{saved_count} label file(s) saved to:\n\n{destination_folder_path}")
@@ -649,6 +911,21 @@ auto_style_frame.pack_forget() # hide initially
 
 tk.Button(window, text="Generate Labels", command=generate_labels).pack(pady=(30, 5))
 
+# === Single-Carton Reprint ===
+reprint_po_var = tk.StringVar()
+reprint_carton_var = tk.StringVar()
+reprint_invoice_var = tk.StringVar()
+
+reprint_frame = tk.LabelFrame(window, text="Reprint Carton Label")
+tk.Label(reprint_frame, text="PO #:").grid(row=0, column=0, sticky="w")
+tk.Entry(reprint_frame, textvariable=reprint_po_var, width=15).grid(row=0, column=1, padx=5)
+tk.Label(reprint_frame, text="Carton #:").grid(row=0, column=2, sticky="w")
+tk.Entry(reprint_frame, textvariable=reprint_carton_var, width=6).grid(row=0, column=3, padx=5)
+tk.Label(reprint_frame, text="Invoice # (optional):").grid(row=1, column=0, columnspan=2, sticky="w")
+tk.Entry(reprint_frame, textvariable=reprint_invoice_var, width=15).grid(row=1, column=2, columnspan=2, padx=5, sticky="w")
+tk.Button(reprint_frame, text="Reprint", command=reprint_carton_label).grid(row=0, column=4, rowspan=2, padx=5)
+reprint_frame.pack(padx=10, pady=(5, 5))
+
 
 
 style_frame = tk.LabelFrame(window, text="Product Field Overrides")